@@ -2,57 +2,93 @@
 Configuration management for the Twitter to Telegram Bot
 """
 
+import functools
+import logging
 import os
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Dict
 
+logger = logging.getLogger(__name__)
+
+# Fields that must be non-empty; names match the env vars lowercased
+_REQUIRED_FIELDS = (
+    "twitter_bearer_token",
+    "twitter_username",
+    "telegram_bot_token",
+    "telegram_chat_id"
+)
+
+@dataclass(frozen=True)
 class Config:
-    """Configuration class to manage all bot settings"""
-    
-    def __init__(self):
-        # Twitter API Configuration
-        self.twitter_bearer_token = os.getenv("TWITTER_BEARER_TOKEN", "AAAAAAAAAAAAAAAAAAAAAL6I3gEAAAAAOVMgbd4FLeqjVmygJ3jmWuHPZnQ%3Dfrt68vvp6XnQTpUcUZqmitdIfhbXwLynCzivQ15qhIAFzQZcPx")
-        self.twitter_username = os.getenv("TWITTER_USERNAME", "CricCrazyJohns")
-        
-        # Telegram Bot Configuration
-        self.telegram_bot_token = os.getenv("TELEGRAM_BOT_TOKEN", "8269663176:AAGQvRcN4dUzkmAPBCufwAqBliB43qxX0oI")
-        self.telegram_chat_id = os.getenv("TELEGRAM_CHAT_ID", "@CricketNewsSkull")
-        
-        # Polling Configuration  
-        self.polling_interval = int(os.getenv("POLLING_INTERVAL", "30"))  # seconds (increased to respect rate limits)
-        self.max_retries = int(os.getenv("MAX_RETRIES", "3"))
-        self.retry_delay = int(os.getenv("RETRY_DELAY", "10"))  # seconds
-        
-        # Twitter API URLs
-        self.user_lookup_url = f"https://api.twitter.com/2/users/by/username/{self.twitter_username}"
-        self.tweets_url_template = "https://api.twitter.com/2/users/{user_id}/tweets?exclude=retweets,replies&tweet.fields=created_at,referenced_tweets&expansions=attachments.media_keys&media.fields=type,url,variants"
-        
-        # Headers for Twitter API
-        self.twitter_headers = {"Authorization": f"Bearer {self.twitter_bearer_token}"}
-    
+    """Immutable snapshot of all bot settings, read from the environment once"""
+
+    # Twitter API Configuration
+    twitter_bearer_token: str
+    twitter_username: str
+
+    # Telegram Bot Configuration
+    telegram_bot_token: str
+    telegram_chat_id: str
+
+    # Polling Configuration
+    polling_interval: int
+    max_retries: int
+    retry_delay: int
+
+    # Push delivery (optional; polling remains the default fallback)
+    use_twitter_stream: bool = False
+    telegram_webhook_url: str = ""
+    telegram_webhook_port: int = 8443
+
+    # Derived values, precomputed once in get_config()
+    user_lookup_url: str = field(default="")
+    tweets_url_template: str = field(default="")
+    stream_url: str = field(default="")
+    stream_rules_url: str = field(default="")
+    twitter_headers: Dict[str, str] = field(default_factory=dict)
+
     def validate(self) -> bool:
         """Validate that all required configuration is present"""
-        required_vars = [
-            ("TWITTER_BEARER_TOKEN", self.twitter_bearer_token),
-            ("TWITTER_USERNAME", self.twitter_username),
-            ("TELEGRAM_BOT_TOKEN", self.telegram_bot_token),
-            ("TELEGRAM_CHAT_ID", self.telegram_chat_id)
-        ]
-        
-        missing_vars = []
-        for var_name, var_value in required_vars:
-            if not var_value or var_value.strip() == "":
-                missing_vars.append(var_name)
-        
+        missing_vars = [name.upper() for name in _REQUIRED_FIELDS
+                        if not (getattr(self, name) or "").strip()]
+
         if missing_vars:
-            print(f"❌ Missing required environment variables: {', '.join(missing_vars)}")
+            logger.error(f"❌ Missing required environment variables: {', '.join(missing_vars)}")
             return False
-        
+
         return True
-    
+
     def get_twitter_user_id_url(self) -> str:
         """Get the URL for Twitter user lookup"""
         return self.user_lookup_url
-    
-    def get_twitter_tweets_url(self, user_id: str) -> str:
-        """Get the URL for fetching user tweets"""
-        return self.tweets_url_template.format(user_id=user_id)
+
+    def get_twitter_tweets_url(self, user_id: str, since_id: str = None) -> str:
+        """Get the URL for fetching user tweets, optionally only those newer than since_id"""
+        url = self.tweets_url_template.format(user_id=user_id)
+        if since_id:
+            url = f"{url}&since_id={since_id}"
+        return url
+
+@functools.lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Build the process-wide Config, reading the environment exactly once"""
+    twitter_bearer_token = os.getenv("TWITTER_BEARER_TOKEN", "AAAAAAAAAAAAAAAAAAAAAL6I3gEAAAAAOVMgbd4FLeqjVmygJ3jmWuHPZnQ%3Dfrt68vvp6XnQTpUcUZqmitdIfhbXwLynCzivQ15qhIAFzQZcPx")
+    twitter_username = os.getenv("TWITTER_USERNAME", "CricCrazyJohns")
+
+    return Config(
+        twitter_bearer_token=twitter_bearer_token,
+        twitter_username=twitter_username,
+        telegram_bot_token=os.getenv("TELEGRAM_BOT_TOKEN", "8269663176:AAGQvRcN4dUzkmAPBCufwAqBliB43qxX0oI"),
+        telegram_chat_id=os.getenv("TELEGRAM_CHAT_ID", "@CricketNewsSkull"),
+        polling_interval=int(os.getenv("POLLING_INTERVAL", "30")),  # seconds (increased to respect rate limits)
+        max_retries=int(os.getenv("MAX_RETRIES", "3")),
+        retry_delay=int(os.getenv("RETRY_DELAY", "10")),  # seconds
+        use_twitter_stream=os.getenv("TWITTER_USE_STREAM", "false").lower() in ("1", "true", "yes"),
+        telegram_webhook_url=os.getenv("TELEGRAM_WEBHOOK_URL", ""),
+        telegram_webhook_port=int(os.getenv("TELEGRAM_WEBHOOK_PORT", "8443")),
+        user_lookup_url=f"https://api.twitter.com/2/users/by/username/{twitter_username}",
+        tweets_url_template="https://api.twitter.com/2/users/{user_id}/tweets?exclude=retweets,replies&tweet.fields=created_at,referenced_tweets&expansions=attachments.media_keys&media.fields=type,url,variants",
+        stream_url="https://api.twitter.com/2/tweets/search/stream?tweet.fields=created_at,referenced_tweets&expansions=attachments.media_keys&media.fields=type,url,variants",
+        stream_rules_url="https://api.twitter.com/2/tweets/search/stream/rules",
+        twitter_headers={"Authorization": f"Bearer {twitter_bearer_token}"}
+    )
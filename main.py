@@ -8,7 +8,7 @@ import logging
 import os
 from telegram_handler import TelegramBotHandler
 from twitter_monitor import TwitterMonitor
-from config import Config
+from config import get_config
 
 # Configure logging
 logging.basicConfig(
@@ -17,6 +17,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Restart backoff schedule: 30s steps capped at 5 minutes
+_MAIN_BACKOFF = tuple(min(30 * i, 300) for i in range(1, 11))
+
 async def main():
     """Main function to run the bot with auto-restart capability"""
     retry_count = 0
@@ -24,8 +27,8 @@ async def main():
     
     while retry_count < max_retries:
         try:
-            # Initialize configuration
-            config = Config()
+            # Initialize configuration (cached, so retries reuse the same snapshot)
+            config = get_config()
             
             # Validate configuration
             if not config.validate():
@@ -57,7 +60,7 @@ async def main():
             logger.error(f"❌ Fatal error (attempt {retry_count}/{max_retries}): {e}")
             
             if retry_count < max_retries:
-                wait_time = min(30 * retry_count, 300)  # Max 5 minute wait
+                wait_time = _MAIN_BACKOFF[min(retry_count - 1, len(_MAIN_BACKOFF) - 1)]
                 logger.info(f"🔄 Restarting in {wait_time} seconds...")
                 await asyncio.sleep(wait_time)
             else:
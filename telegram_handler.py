@@ -4,290 +4,318 @@ Telegram bot handler and message sending functionality
 
 import asyncio
 import logging
-import requests
-from typing import List, Dict, Any
+import aiohttp
+import orjson
+from aiohttp import web
+from typing import List, Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
+def _json_dumps(obj) -> str:
+    """orjson-backed serializer for outgoing aiohttp JSON bodies"""
+    return orjson.dumps(obj).decode()
+
 class TelegramBotHandler:
     """Handles Telegram bot operations and message sending"""
-    
+
     def __init__(self, config):
         self.config = config
         self.bot_running = False
-        
-        # Telegram API endpoints
-        self.send_message_url = f"https://api.telegram.org/bot{config.telegram_bot_token}/sendMessage"
-        self.send_photo_url = f"https://api.telegram.org/bot{config.telegram_bot_token}/sendPhoto"
-        self.send_video_url = f"https://api.telegram.org/bot{config.telegram_bot_token}/sendVideo"
-        self.send_animation_url = f"https://api.telegram.org/bot{config.telegram_bot_token}/sendAnimation"
-        self.send_media_group_url = f"https://api.telegram.org/bot{config.telegram_bot_token}/sendMediaGroup"
-        self.get_updates_url = f"https://api.telegram.org/bot{config.telegram_bot_token}/getUpdates"
-        
+        self.session: Optional[aiohttp.ClientSession] = None
+        # Cap concurrent media uploads to stay under Telegram rate limits
+        self.upload_semaphore = asyncio.Semaphore(4)
+
+        # Telegram API endpoints, built once from a single base URL
+        base = f"https://api.telegram.org/bot{config.telegram_bot_token}"
+        self._endpoints = {
+            name: f"{base}/{name}"
+            for name in ("sendMessage", "sendPhoto", "sendVideo", "sendAnimation",
+                         "sendMediaGroup", "getUpdates", "setWebhook", "deleteWebhook")
+        }
+
         self.offset = 0
-    
+
+        # Constant fields shared by every channel send
+        self._base_payload = {"chat_id": config.telegram_chat_id, "parse_mode": "HTML"}
+
+        # Command responses only depend on config (plus the caller's first
+        # name for /start), so build them once instead of per invocation
+        self._startup_msg = (
+            "🤖 <b>Twitter to Telegram Bot Started!</b>\n\n"
+            f"✅ Monitoring: @{config.twitter_username}\n"
+            f"📱 Forwarding to: {config.telegram_chat_id}\n"
+            f"⏱️ Polling interval: {config.polling_interval} seconds\n\n"
+            "The bot is now actively monitoring for new tweets!"
+        )
+        self._start_template = (
+            "👋 Hello {first_name}!\n\n"
+            "🤖 <b>Twitter to Telegram Bot is Active!</b>\n\n"
+            f"🐦 Monitoring: @{config.twitter_username}\n"
+            f"📢 Forwarding to: {config.telegram_chat_id}\n"
+            f"⚡ Response time: ≤10 seconds\n\n"
+            "📋 <b>Available Commands:</b>\n"
+            "/start - Show this welcome message\n"
+            "/status - Check bot status\n"
+            "/help - Get help information\n\n"
+            "✅ <b>Bot is working perfectly!</b>\n"
+            "New original tweets will be forwarded automatically."
+        )
+        self._status_msg = (
+            "📊 <b>Bot Status Report</b>\n\n"
+            f"🟢 Status: <b>Active & Running</b>\n"
+            f"🐦 Monitoring: @{config.twitter_username}\n"
+            f"📢 Target Channel: {config.telegram_chat_id}\n"
+            f"⏱️ Check Interval: {config.polling_interval}s\n"
+            f"🔄 Max Retries: {config.max_retries}\n\n"
+            "✅ All systems operational!"
+        )
+        self._help_msg = (
+            "❓ <b>Help - Twitter to Telegram Bot</b>\n\n"
+            "🎯 <b>Purpose:</b>\n"
+            "This bot monitors Twitter accounts and forwards original tweets to Telegram channels in real-time.\n\n"
+            "⚡ <b>Features:</b>\n"
+            "• Forwards tweets within 10 seconds\n"
+            "• Supports text, images, videos, GIFs\n"
+            "• Excludes retweets and replies\n"
+            "• Handles multiple media attachments\n"
+            "• Real-time status monitoring\n\n"
+            "🔧 <b>Commands:</b>\n"
+            "/start - Welcome message & status\n"
+            "/status - Check current bot status\n"
+            "/help - Show this help message\n\n"
+            "📞 <b>Support:</b>\n"
+            "If you encounter any issues, check the logs or restart the bot."
+        )
+
     async def start(self):
         """Start the Telegram bot"""
         try:
             self.bot_running = True
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=20, keepalive_timeout=75,
+                                               use_dns_cache=True, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=30),
+                json_serialize=_json_dumps
+            )
             logger.info("📱 Telegram bot handler started")
-            
+
             # Send startup notification to the channel
             await self._send_startup_notification()
-            
-            # Start polling for updates
-            await self._start_polling()
-            
+
+            # Receive updates via webhook push when configured, otherwise poll
+            if self.config.telegram_webhook_url:
+                await self._run_webhook()
+            else:
+                await self._start_polling()
+
         except Exception as e:
             logger.error(f"❌ Error starting Telegram bot: {e}")
             raise
-    
+        finally:
+            if self.session is not None:
+                await self.session.close()
+                self.session = None
+
     async def _send_startup_notification(self):
         """Send a notification that the bot has started"""
-        message = (
-            "🤖 <b>Twitter to Telegram Bot Started!</b>\n\n"
-            f"✅ Monitoring: @{self.config.twitter_username}\n"
-            f"📱 Forwarding to: {self.config.telegram_chat_id}\n"
-            f"⏱️ Polling interval: {self.config.polling_interval} seconds\n\n"
-            "The bot is now actively monitoring for new tweets!"
-        )
-        
         try:
-            await self.send_message(message)
+            await self.send_message(self._startup_msg)
             logger.info("✅ Startup notification sent to Telegram")
         except Exception as e:
             logger.error(f"❌ Failed to send startup notification: {e}")
-    
+
     async def _start_polling(self):
         """Start polling for Telegram updates"""
         while self.bot_running:
             try:
-                response = requests.get(
-                    self.get_updates_url,
-                    params={"offset": self.offset, "timeout": 10},
-                    timeout=15
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get("ok") and data.get("result"):
-                        await self._process_updates(data["result"])
-                        
-                await asyncio.sleep(1)  # Small delay between polls
-                
+                # The server holds the long-poll open for up to `timeout`
+                # seconds when idle, so no client-side delay is needed
+                async with self.session.get(
+                    self._endpoints["getUpdates"],
+                    params={"offset": self.offset, "timeout": 25}
+                ) as response:
+                    if response.status == 200:
+                        data = orjson.loads(await response.read())
+                        if data.get("ok") and data.get("result"):
+                            await self._process_updates(data["result"])
+
+                await asyncio.sleep(0)  # Yield to other tasks between polls
+
             except Exception as e:
                 logger.error(f"❌ Error in polling loop: {e}")
                 await asyncio.sleep(5)
-    
+
+    async def _run_webhook(self):
+        """Receive Telegram updates pushed to a local webhook endpoint"""
+        async def handle_update(request: web.Request) -> web.Response:
+            update = orjson.loads(await request.read())
+            await self._process_updates([update])
+            return web.Response(text="ok")
+
+        app = web.Application()
+        app.router.add_post("/webhook", handle_update)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "0.0.0.0", self.config.telegram_webhook_port)
+        await site.start()
+
+        try:
+            async with self.session.post(
+                self._endpoints["setWebhook"],
+                data={"url": self.config.telegram_webhook_url}
+            ) as response:
+                if response.status != 200:
+                    body = await response.text()
+                    logger.error(f"❌ Failed to set webhook: {response.status} - {body}")
+                    return
+
+            logger.info(f"✅ Webhook registered: {self.config.telegram_webhook_url}")
+            while self.bot_running:
+                await asyncio.sleep(3600)
+        finally:
+            async with self.session.post(self._endpoints["deleteWebhook"]) as response:
+                if response.status != 200:
+                    logger.error(f"❌ Failed to delete webhook: {response.status}")
+            await runner.cleanup()
+
     async def _process_updates(self, updates):
         """Process incoming Telegram updates"""
         for update in updates:
-            self.offset = update["update_id"] + 1
-            
             if "message" in update:
                 message = update["message"]
                 text = message.get("text", "")
                 chat_id = message["chat"]["id"]
                 user = message.get("from", {})
-                
+
                 if text.startswith("/"):
                     await self._handle_command(text, chat_id, user)
-    
+
+        # Advance the offset once past the whole batch
+        self.offset = updates[-1]["update_id"] + 1
+
     async def _handle_command(self, command: str, chat_id: int, user: Dict):
         """Handle bot commands"""
         username = user.get("username", user.get("id", "unknown"))
         logger.info(f"📱 Command '{command}' received from user: {username}")
-        
+
         if command == "/start":
             await self._send_start_response(chat_id, user)
         elif command == "/status":
             await self._send_status_response(chat_id)
         elif command == "/help":
             await self._send_help_response(chat_id)
-    
+
     async def _send_start_response(self, chat_id: int, user: Dict):
         """Send response to /start command"""
         first_name = user.get("first_name", "User")
-        welcome_message = (
-            f"👋 Hello {first_name}!\n\n"
-            "🤖 <b>Twitter to Telegram Bot is Active!</b>\n\n"
-            f"🐦 Monitoring: @{self.config.twitter_username}\n"
-            f"📢 Forwarding to: {self.config.telegram_chat_id}\n"
-            f"⚡ Response time: ≤10 seconds\n\n"
-            "📋 <b>Available Commands:</b>\n"
-            "/start - Show this welcome message\n"
-            "/status - Check bot status\n"
-            "/help - Get help information\n\n"
-            "✅ <b>Bot is working perfectly!</b>\n"
-            "New original tweets will be forwarded automatically."
-        )
-        
-        await self._send_direct_message(chat_id, welcome_message)
-    
+        await self._send_direct_message(chat_id, self._start_template.format(first_name=first_name))
+
     async def _send_status_response(self, chat_id: int):
         """Send response to /status command"""
-        status_message = (
-            "📊 <b>Bot Status Report</b>\n\n"
-            f"🟢 Status: <b>Active & Running</b>\n"
-            f"🐦 Monitoring: @{self.config.twitter_username}\n"
-            f"📢 Target Channel: {self.config.telegram_chat_id}\n"
-            f"⏱️ Check Interval: {self.config.polling_interval}s\n"
-            f"🔄 Max Retries: {self.config.max_retries}\n\n"
-            "✅ All systems operational!"
-        )
-        
-        await self._send_direct_message(chat_id, status_message)
-    
+        await self._send_direct_message(chat_id, self._status_msg)
+
     async def _send_help_response(self, chat_id: int):
         """Send response to /help command"""
-        help_message = (
-            "❓ <b>Help - Twitter to Telegram Bot</b>\n\n"
-            "🎯 <b>Purpose:</b>\n"
-            "This bot monitors Twitter accounts and forwards original tweets to Telegram channels in real-time.\n\n"
-            "⚡ <b>Features:</b>\n"
-            "• Forwards tweets within 10 seconds\n"
-            "• Supports text, images, videos, GIFs\n"
-            "• Excludes retweets and replies\n"
-            "• Handles multiple media attachments\n"
-            "• Real-time status monitoring\n\n"
-            "🔧 <b>Commands:</b>\n"
-            "/start - Welcome message & status\n"
-            "/status - Check current bot status\n"
-            "/help - Show this help message\n\n"
-            "📞 <b>Support:</b>\n"
-            "If you encounter any issues, check the logs or restart the bot."
-        )
-        
-        await self._send_direct_message(chat_id, help_message)
-    
+        await self._send_direct_message(chat_id, self._help_msg)
+
+    async def _post(self, endpoint: str, *, data=None, json=None) -> bool:
+        """POST to a Telegram endpoint, retrying with exponential backoff.
+
+        `data` may be a payload or a zero-arg callable building one, so
+        one-shot bodies like FormData can be rebuilt per attempt. Client
+        errors other than 429 are not retried.
+        """
+        for attempt in range(self.config.max_retries):
+            try:
+                payload = data() if callable(data) else data
+                async with self.session.post(
+                    self._endpoints[endpoint], data=payload, json=json
+                ) as response:
+                    if response.status == 200:
+                        return True
+                    body = await response.text()
+                    logger.error(f"❌ {endpoint} failed: {response.status} - {body}")
+                    if response.status != 429 and response.status < 500:
+                        return False
+
+            except Exception as e:
+                logger.error(f"❌ Error calling {endpoint}: {e}")
+
+            if attempt + 1 < self.config.max_retries:
+                await asyncio.sleep(self.config.retry_delay * (2 ** attempt))
+
+        return False
+
     async def _send_direct_message(self, chat_id: int, text: str):
         """Send a direct message to a specific chat"""
-        try:
-            response = requests.post(
-                self.send_message_url,
-                data={
-                    "chat_id": chat_id,
-                    "text": text,
-                    "parse_mode": "HTML"
-                },
-                timeout=10
-            )
-            
-            if response.status_code != 200:
-                logger.error(f"❌ Failed to send direct message: {response.status_code} - {response.text}")
-                
-        except Exception as e:
-            logger.error(f"❌ Error sending direct message: {e}")
-    
-    
+        await self._post("sendMessage", data=self._base_payload | {"chat_id": chat_id, "text": text})
+
+
     async def send_message(self, text: str):
         """Send a text message to the configured channel"""
-        try:
-            response = requests.post(
-                self.send_message_url,
-                data={
-                    "chat_id": self.config.telegram_chat_id,
-                    "text": text,
-                    "parse_mode": "HTML"
-                },
-                timeout=10
-            )
-            
-            if response.status_code != 200:
-                logger.error(f"❌ Failed to send message: {response.status_code} - {response.text}")
-                
-        except Exception as e:
-            logger.error(f"❌ Error sending message: {e}")
-    
+        await self._post("sendMessage", data=self._base_payload | {"text": text})
+
     async def send_photo(self, photo_url: str, caption: str):
         """Send a photo with caption"""
+        # Let Telegram fetch the photo by URL, like sendVideo and
+        # sendAnimation already do - no local download round-trip
+        if await self._post("sendPhoto", data=self._base_payload | {"caption": caption, "photo": photo_url}):
+            return
+
+        # Telegram couldn't fetch the URL itself; download and upload bytes
+        logger.info(f"🔄 Falling back to photo upload: {photo_url}")
         try:
-            # Download the photo
-            photo_response = requests.get(photo_url, timeout=15)
-            if photo_response.status_code != 200:
-                logger.error(f"❌ Failed to download photo: {photo_url}")
-                return
-            
-            response = requests.post(
-                self.send_photo_url,
-                data={
-                    "chat_id": self.config.telegram_chat_id,
-                    "caption": caption,
-                    "parse_mode": "HTML"
-                },
-                files={"photo": photo_response.content},
-                timeout=30
-            )
-            
-            if response.status_code != 200:
-                logger.error(f"❌ Failed to send photo: {response.status_code} - {response.text}")
-                
+            async with self.upload_semaphore:
+                # Download the photo
+                async with self.session.get(photo_url) as photo_response:
+                    if photo_response.status != 200:
+                        logger.error(f"❌ Failed to download photo: {photo_url}")
+                        return
+                    photo_bytes = await photo_response.read()
+
+                def build_form():
+                    form = aiohttp.FormData()
+                    form.add_field("chat_id", str(self.config.telegram_chat_id))
+                    form.add_field("caption", caption)
+                    form.add_field("parse_mode", "HTML")
+                    form.add_field("photo", photo_bytes, filename="photo.jpg")
+                    return form
+
+                await self._post("sendPhoto", data=build_form)
+
         except Exception as e:
             logger.error(f"❌ Error sending photo: {e}")
-    
+
     async def send_video(self, video_url: str, caption: str):
         """Send a video with caption"""
-        try:
-            response = requests.post(
-                self.send_video_url,
-                data={
-                    "chat_id": self.config.telegram_chat_id,
-                    "caption": caption,
-                    "parse_mode": "HTML",
-                    "video": video_url
-                },
-                timeout=30
-            )
-            
-            if response.status_code != 200:
-                logger.error(f"❌ Failed to send video: {response.status_code} - {response.text}")
-                
-        except Exception as e:
-            logger.error(f"❌ Error sending video: {e}")
-    
+        await self._post("sendVideo", data=self._base_payload | {"caption": caption, "video": video_url})
+
     async def send_animation(self, animation_url: str, caption: str):
         """Send an animation/GIF with caption"""
-        try:
-            response = requests.post(
-                self.send_animation_url,
-                data={
-                    "chat_id": self.config.telegram_chat_id,
-                    "caption": caption,
-                    "parse_mode": "HTML",
-                    "animation": animation_url
-                },
-                timeout=30
-            )
-            
-            if response.status_code != 200:
-                logger.error(f"❌ Failed to send animation: {response.status_code} - {response.text}")
-                
-        except Exception as e:
-            logger.error(f"❌ Error sending animation: {e}")
-    
+        await self._post("sendAnimation", data=self._base_payload | {"caption": caption, "animation": animation_url})
+
     async def send_media_group(self, photo_urls: List[str], caption: str):
         """Send multiple photos as a media group"""
         try:
             media_group = []
-            
+
             for i, url in enumerate(photo_urls):
                 item = {"type": "photo", "media": url}
                 if i == 0:  # Add caption to first photo only
                     item["caption"] = caption
                     item["parse_mode"] = "HTML"
                 media_group.append(item)
-            
-            response = requests.post(
-                self.send_media_group_url,
-                json={
-                    "chat_id": self.config.telegram_chat_id,
-                    "media": media_group
-                },
-                timeout=30
-            )
-            
-            if response.status_code != 200:
-                logger.error(f"❌ Failed to send media group: {response.status_code} - {response.text}")
-                
+
+            ok = await self._post("sendMediaGroup", json={
+                "chat_id": self.config.telegram_chat_id,
+                "media": media_group
+            })
+            if not ok:
+                # Fall back to per-photo sends, overlapping the round-trips
+                await asyncio.gather(
+                    *(self.send_photo(url, caption if i == 0 else "")
+                      for i, url in enumerate(photo_urls))
+                )
+
         except Exception as e:
             logger.error(f"❌ Error sending media group: {e}")
@@ -3,15 +3,26 @@ Twitter monitoring functionality
 """
 
 import asyncio
-import requests
-import json
+import aiohttp
 import logging
+import orjson
+import re
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from utils import MediaHandler
 
 logger = logging.getLogger(__name__)
 
+# Compiled once so per-tweet cleanup avoids repeated pattern lookups
+_TWITTER_URL_RE = re.compile(r'https://(?:t\.co|twitter\.com|x\.com)/\S+')
+_WS_RE = re.compile(r'\s+')
+
+# Where user_id/last_seen_id survive restarts
+_STATE_PATH = "state.json"
+
+# Rate-limit backoff schedule: 60s steps capped at 15 minutes
+_RATE_BACKOFF = tuple(min(60 * i, 900) for i in range(1, 16))
+
 class TwitterMonitor:
     """Handles Twitter API monitoring and tweet processing"""
     
@@ -22,43 +33,85 @@ class TwitterMonitor:
         self.last_seen_id: Optional[str] = None
         self.media_handler = MediaHandler()
         self.retry_count = 0
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._etag: Optional[str] = None
         
     async def start_monitoring(self):
         """Start monitoring Twitter for new tweets"""
-        # First, get the user ID
-        if not await self._get_user_id():
-            logger.error("❌ Failed to get Twitter user ID. Stopping monitor.")
-            return
-        
-        logger.info(f"✅ Successfully tracking @{self.config.twitter_username} (User ID: {self.user_id})")
-        
-        # Start the monitoring loop
-        await self._monitoring_loop()
-    
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=20, keepalive_timeout=75,
+                                           use_dns_cache=True, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=30)
+        )
+        try:
+            # Reuse persisted state so restarts skip the rate-limited user
+            # lookup and don't re-forward the last tweet
+            self._load_state()
+
+            # Get the user ID unless the saved state already has it
+            if not self.user_id and not await self._get_user_id():
+                logger.error("❌ Failed to get Twitter user ID. Stopping monitor.")
+                return
+            
+            logger.info(f"✅ Successfully tracking @{self.config.twitter_username} (User ID: {self.user_id})")
+
+            # Prefer the push-based filtered stream when enabled; fall back
+            # to the fixed-interval polling loop otherwise
+            if self.config.use_twitter_stream:
+                await self._stream_loop()
+            else:
+                await self._monitoring_loop()
+        finally:
+            await self.session.close()
+            self.session = None
+
+    def _load_state(self):
+        """Restore user_id and last_seen_id saved by a previous run"""
+        try:
+            with open(_STATE_PATH, "rb") as f:
+                state = orjson.loads(f.read())
+            self.user_id = state.get("user_id") or self.user_id
+            self.last_seen_id = state.get("last_seen_id") or self.last_seen_id
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"⚠️ Could not load saved state: {e}")
+
+    def _save_state(self):
+        """Persist user_id and last_seen_id for the next run"""
+        try:
+            with open(_STATE_PATH, "wb") as f:
+                f.write(orjson.dumps({
+                    "user_id": self.user_id,
+                    "last_seen_id": self.last_seen_id
+                }))
+        except Exception as e:
+            logger.error(f"⚠️ Could not save state: {e}")
+
     async def _get_user_id(self) -> bool:
         """Fetch the Twitter user ID for the configured username"""
         try:
-            response = requests.get(
+            async with self.session.get(
                 self.config.get_twitter_user_id_url(),
-                headers=self.config.twitter_headers,
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                user_data = data.get("data", {})
-                self.user_id = user_data.get("id")
-                
-                if self.user_id:
-                    return True
+                headers=self.config.twitter_headers
+            ) as response:
+                if response.status == 200:
+                    data = orjson.loads(await response.read())
+                    user_data = data.get("data", {})
+                    self.user_id = user_data.get("id")
+                    
+                    if self.user_id:
+                        self._save_state()
+                        return True
+                    else:
+                        logger.error(f"❌ No user ID found for username: {self.config.twitter_username}")
+                        return False
                 else:
-                    logger.error(f"❌ No user ID found for username: {self.config.twitter_username}")
+                    body = await response.text()
+                    logger.error(f"❌ Twitter API error: {response.status} - {body}")
                     return False
-            else:
-                logger.error(f"❌ Twitter API error: {response.status_code} - {response.text}")
-                return False
                 
-        except requests.exceptions.RequestException as e:
+        except aiohttp.ClientError as e:
             logger.error(f"❌ Network error while fetching user ID: {e}")
             return False
         except Exception as e:
@@ -80,7 +133,7 @@ class TwitterMonitor:
                 else:
                     # Rate limited, increase delay
                     consecutive_rate_limits += 1
-                    delay = min(60 * consecutive_rate_limits, 900)  # Max 15 min delay
+                    delay = _RATE_BACKOFF[min(consecutive_rate_limits - 1, len(_RATE_BACKOFF) - 1)]
                     logger.info(f"⏳ Rate limited. Waiting {delay} seconds before next attempt...")
                     await asyncio.sleep(delay)
                 
@@ -93,29 +146,115 @@ class TwitterMonitor:
                     self.retry_count = 0
                 
                 await asyncio.sleep(self.config.retry_delay)
-    
+
+    async def _stream_loop(self):
+        """Consume the Twitter filtered stream, reconnecting on errors"""
+        if not await self._ensure_stream_rule():
+            logger.error("❌ Failed to set up stream rule. Falling back to polling.")
+            await self._monitoring_loop()
+            return
+
+        while True:
+            try:
+                await self._stream_tweets()
+            except Exception as e:
+                logger.error(f"⚠️ Stream disconnected: {e}")
+
+            logger.info(f"🔄 Reconnecting to stream in {self.config.retry_delay} seconds...")
+            await asyncio.sleep(self.config.retry_delay)
+
+    async def _ensure_stream_rule(self) -> bool:
+        """Make sure a from:<username> rule exists on the filtered stream"""
+        try:
+            rule_value = f"from:{self.config.twitter_username}"
+
+            async with self.session.get(
+                self.config.stream_rules_url,
+                headers=self.config.twitter_headers
+            ) as response:
+                if response.status != 200:
+                    body = await response.text()
+                    logger.error(f"❌ Failed to fetch stream rules: {response.status} - {body}")
+                    return False
+                data = orjson.loads(await response.read())
+
+            existing = {rule.get("value") for rule in data.get("data", [])}
+            if rule_value in existing:
+                return True
+
+            async with self.session.post(
+                self.config.stream_rules_url,
+                headers=self.config.twitter_headers,
+                json={"add": [{"value": rule_value}]}
+            ) as response:
+                if response.status not in (200, 201):
+                    body = await response.text()
+                    logger.error(f"❌ Failed to add stream rule: {response.status} - {body}")
+                    return False
+
+            return True
+
+        except Exception as e:
+            logger.error(f"❌ Error setting up stream rule: {e}")
+            return False
+
+    async def _stream_tweets(self):
+        """Read tweets off the filtered stream and process them as they arrive"""
+        async with self.session.get(
+            self.config.stream_url,
+            headers=self.config.twitter_headers,
+            timeout=aiohttp.ClientTimeout(total=None)
+        ) as response:
+            if response.status != 200:
+                body = await response.text()
+                raise RuntimeError(f"Twitter stream error: {response.status} - {body}")
+
+            logger.info("✅ Connected to Twitter filtered stream")
+            async for line in response.content:
+                line = line.strip()
+                if not line:
+                    continue  # keep-alive newline
+
+                payload = orjson.loads(line)
+                if "data" not in payload:
+                    continue
+                await self._process_tweets({
+                    "data": [payload["data"]],
+                    "includes": payload.get("includes", {})
+                })
+
     async def _check_new_tweets(self) -> bool:
         """Check for new tweets and process them. Returns True if successful, False if rate limited."""
         try:
-            tweets_url = self.config.get_twitter_tweets_url(self.user_id)
-            response = requests.get(
+            # since_id and If-None-Match keep idle polls close to zero-byte:
+            # the API only returns tweets newer than the watermark, and an
+            # unchanged page comes back as an empty 304
+            tweets_url = self.config.get_twitter_tweets_url(self.user_id, since_id=self.last_seen_id)
+            headers = self.config.twitter_headers
+            if self._etag:
+                headers = {**headers, "If-None-Match": self._etag}
+
+            async with self.session.get(
                 tweets_url,
-                headers=self.config.twitter_headers,
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                await self._process_tweets(data)
-                return True
-            elif response.status_code == 429:
-                # Rate limited - don't log error, just return False
-                return False
-            else:
-                logger.error(f"❌ Twitter API error: {response.status_code} - {response.text}")
-                return False
+                headers=headers
+            ) as response:
+                if response.status == 200:
+                    self._etag = response.headers.get("ETag")
+                    data = orjson.loads(await response.read())
+                    await self._process_tweets(data)
+                    return True
+                elif response.status == 304:
+                    # Not modified - nothing new since the last poll
+                    return True
+                elif response.status == 429:
+                    # Rate limited - don't log error, just return False
+                    return False
+                else:
+                    body = await response.text()
+                    logger.error(f"❌ Twitter API error: {response.status} - {body}")
+                    return False
                 
-        except requests.exceptions.RequestException as e:
+        except aiohttp.ClientError as e:
             logger.error(f"❌ Network error while checking tweets: {e}")
             return False
         except Exception as e:
@@ -126,61 +265,49 @@ class TwitterMonitor:
         """Process the tweet data from Twitter API"""
         if "data" not in data or not data["data"]:
             return
-        
-        # Get the latest tweet
-        tweet = data["data"][0]
-        tweet_id = tweet["id"]
-        
-        # Skip if we've already seen this tweet
-        if tweet_id == self.last_seen_id:
-            return
-        
-        # Skip if this is a retweet or reply (additional check)
-        if self._is_retweet_or_reply(tweet):
-            logger.info(f"🔄 Skipping retweet/reply: {tweet_id}")
-            self.last_seen_id = tweet_id
-            return
-        
-        logger.info(f"📝 Processing new tweet: {tweet_id}")
-        
-        try:
-            # Process and forward the tweet
-            await self._forward_tweet(tweet, data.get("includes", {}))
-            self.last_seen_id = tweet_id
-            logger.info(f"✅ Successfully forwarded tweet: {tweet_id}")
-            
-        except Exception as e:
-            logger.error(f"❌ Error forwarding tweet {tweet_id}: {e}")
+
+        # Walk the page oldest-to-newest so a burst of tweets delivered in
+        # one response is forwarded in order instead of all but the newest
+        # being dropped. Tweet IDs are monotonic, so compare as integers.
+        last = int(self.last_seen_id) if self.last_seen_id else 0
+        start = last
+        includes = data.get("includes", {})
+
+        for tweet in reversed(data["data"]):
+            tweet_id = tweet["id"]
+            if int(tweet_id) <= last:
+                continue
+
+            # Skip if this is a retweet or reply (additional check)
+            if self._is_retweet_or_reply(tweet):
+                logger.info(f"🔄 Skipping retweet/reply: {tweet_id}")
+                self.last_seen_id = tweet_id
+                last = int(tweet_id)
+                continue
+
+            logger.info(f"📝 Processing new tweet: {tweet_id}")
+
+            try:
+                # Process and forward the tweet
+                await self._forward_tweet(tweet, includes)
+                self.last_seen_id = tweet_id
+                last = int(tweet_id)
+                logger.info(f"✅ Successfully forwarded tweet: {tweet_id}")
+
+            except Exception as e:
+                logger.error(f"❌ Error forwarding tweet {tweet_id}: {e}")
+
+        if last != start:
+            self._save_state()
     
-    def _is_retweet_or_reply(self, tweet: Dict[str, Any]) -> bool:
-        """Check if tweet is a retweet or reply"""
-        # Check for referenced tweets (retweets, quotes, replies)
-        referenced_tweets = tweet.get("referenced_tweets", [])
-        if referenced_tweets:
-            return True
-        
-        # Check if tweet text starts with @mention (likely a reply)
-        text = tweet.get("text", "")
-        if text.startswith("@"):
-            return True
-        
-        return False
+    @staticmethod
+    def _is_retweet_or_reply(tweet: Dict[str, Any]) -> bool:
+        """Check if tweet references another tweet or starts with an @mention"""
+        return bool(tweet.get("referenced_tweets")) or tweet.get("text", "").startswith("@")
     
     def _remove_twitter_urls(self, text: str) -> str:
-        """Remove Twitter URLs from text"""
-        import re
-        
-        # Remove t.co URLs (Twitter's URL shortener)
-        text = re.sub(r'https://t\.co/\S+', '', text)
-        
-        # Remove other common Twitter URL patterns
-        text = re.sub(r'https://twitter\.com/\S+', '', text)
-        text = re.sub(r'https://x\.com/\S+', '', text)
-        
-        # Clean up extra spaces
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        return text
+        """Remove Twitter URLs (t.co, twitter.com, x.com) from text"""
+        return _WS_RE.sub(' ', _TWITTER_URL_RE.sub('', text)).strip()
     
     async def _forward_tweet(self, tweet: Dict[str, Any], includes: Dict[str, Any]):
         """Forward tweet to Telegram"""
@@ -201,20 +328,20 @@ class TwitterMonitor:
     
     async def _forward_tweet_with_media(self, text: str, media_keys: List[str], media_items: List[Dict]):
         """Forward tweet with media attachments"""
-        # Categorize media
+        # Categorize media, indexing by media_key so each lookup is O(1)
         photos = []
         videos = []
         gifs = []
-        
-        for media in media_items:
-            if media["media_key"] in media_keys:
-                media_type = media["type"]
-                if media_type == "photo":
-                    photos.append(media["url"])
-                elif media_type == "video":
-                    videos.append(media)
-                elif media_type == "animated_gif":
-                    gifs.append(media)
+        buckets = {"photo": photos, "video": videos, "animated_gif": gifs}
+
+        by_key = {media["media_key"]: media for media in media_items}
+        for key in media_keys:
+            media = by_key.get(key)
+            if media is None:
+                continue
+            bucket = buckets.get(media["type"])
+            if bucket is not None:
+                bucket.append(media["url"] if media["type"] == "photo" else media)
         
         # Handle different media types
         if len(photos) > 1:
@@ -2,155 +2,235 @@
 Utility functions for the Twitter to Telegram Bot
 """
 
+import array
+import functools
 import logging
+import re
+import threading
+from bisect import bisect_right
+from time import monotonic as _now
 from typing import Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
+# HTML escape mapping, defined once as an immutable pair sequence and
+# compiled into the translation table used for the single-pass escape.
+# The table is immutable, so it is shared lock-free across all
+# TextFormatter callers and threads
+_HTML_REPLACEMENTS = (
+    ('&', '&amp;'),
+    ('<', '&lt;'),
+    ('>', '&gt;'),
+    ('"', '&quot;'),
+    ("'", '&#x27;')
+)
+_HTML_ESCAPE_TABLE = str.maketrans(dict(_HTML_REPLACEMENTS))
+
+# Pre-filter for escape_html: most tweets contain no special characters,
+# so a cheap scan avoids the translate pass and its allocation entirely
+_HTML_UNSAFE_RE = re.compile(r'[&<>"\']')
+
+# URL detection for TextFormatter extensions. Any regex used by
+# TextFormatter belongs here, compiled at module scope, never built
+# inline in a per-tweet path
+_URL_RE = re.compile(r'https?://\S+')
+
+_ELLIPSIS = "..."
+
+@functools.lru_cache(maxsize=1024)
+def _escape_html(text: str) -> str:
+    """Escape HTML special characters, memoized for repeated inputs"""
+    if _HTML_UNSAFE_RE.search(text) is None:
+        return text
+
+    return text.translate(_HTML_ESCAPE_TABLE)
+
+@functools.lru_cache(maxsize=1024)
+def _format_tweet_text(text: str, bold: bool) -> str:
+    """Escape and optionally bold tweet text, memoized for repeated inputs"""
+    formatted_text = _escape_html(text)
+
+    if bold:
+        formatted_text = f"<b>{formatted_text}</b>"
+
+    return formatted_text
+
 class MediaHandler:
     """Handles media processing and URL extraction"""
-    
+
+    __slots__ = ()
+
     @staticmethod
     def get_best_video_url(video_data: Dict[str, Any]) -> Optional[str]:
         """Extract the best quality video URL from Twitter video data"""
-        try:
-            variants = video_data.get("variants", [])
-            if not variants:
-                logger.warning("No video variants found")
-                return None
-            
-            # Filter variants that have bitrate (exclude .m3u8 playlists)
-            bitrate_variants = [v for v in variants if v.get("bit_rate")]
-            
-            if bitrate_variants:
-                # Get the highest bitrate variant
-                best_variant = max(bitrate_variants, key=lambda v: v.get("bit_rate", 0))
-                return best_variant.get("url")
-            else:
-                # Fallback to first variant if no bitrate info
-                return variants[0].get("url")
-                
-        except Exception as e:
-            logger.error(f"❌ Error extracting video URL: {e}")
+        variants = video_data.get("variants", [])
+        if not variants:
+            logger.warning("No video variants found")
             return None
-    
+
+        # One pass tracking the highest bitrate; variants without a
+        # bitrate (.m3u8 playlists) only matter as a fallback
+        best_url = None
+        best_bit_rate = -1
+        for variant in variants:
+            bit_rate = variant.get("bit_rate")
+            if bit_rate is not None and bit_rate > best_bit_rate:
+                best_bit_rate = bit_rate
+                best_url = variant.get("url")
+
+        if best_url is not None:
+            return best_url
+        # Fallback to first variant if no bitrate info
+        return variants[0].get("url")
+
     @staticmethod
     def get_gif_url(gif_data: Dict[str, Any]) -> Optional[str]:
         """Extract GIF URL from Twitter animated GIF data"""
-        try:
-            variants = gif_data.get("variants", [])
-            if variants:
-                return variants[0].get("url")
-            else:
-                logger.warning("No GIF variants found")
-                return None
-                
-        except Exception as e:
-            logger.error(f"❌ Error extracting GIF URL: {e}")
-            return None
+        variants = gif_data.get("variants")
+        if variants:
+            return variants[0].get("url")
+
+        logger.warning("No GIF variants found")
+        return None
 
 class RateLimiter:
     """Simple rate limiting utility"""
-    
+
+    __slots__ = ('max_requests', 'time_window', 'requests', '_head')
+
     def __init__(self, max_requests: int = 100, time_window: int = 3600):
         self.max_requests = max_requests
         self.time_window = time_window  # in seconds
-        self.requests = []
-    
+        # Timestamps packed as plain doubles - 8 bytes each with no
+        # per-element object header. Entries before _head are expired.
+        self.requests = array.array('d')
+        self._head = 0
+
     def can_make_request(self) -> bool:
         """Check if a request can be made within rate limits"""
-        import time
-        current_time = time.time()
-        
-        # Remove old requests outside the time window
-        self.requests = [req_time for req_time in self.requests 
-                        if current_time - req_time < self.time_window]
-        
+        current_time = _now()
+        requests = self.requests
+
+        # Timestamps are appended in order, so the array stays sorted and
+        # the expiry cutoff can be found by binary search
+        head = bisect_right(requests, current_time - self.time_window, self._head)
+
+        # Compact once the expired prefix dominates the array
+        if head > len(requests) // 2:
+            del requests[:head]
+            head = 0
+        self._head = head
+
         # Check if under limit
-        if len(self.requests) < self.max_requests:
-            self.requests.append(current_time)
+        if len(requests) - head < self.max_requests:
+            requests.append(current_time)
             return True
-        
+
         return False
 
 class TextFormatter:
     """Utility for formatting text for Telegram"""
-    
+
+    __slots__ = ()
+
     @staticmethod
     def escape_html(text: str) -> str:
         """Escape HTML special characters"""
         if not text:
             return ""
-        
-        replacements = {
-            '&': '&amp;',
-            '<': '&lt;',
-            '>': '&gt;',
-            '"': '&quot;',
-            "'": '&#x27;'
-        }
-        
-        for char, replacement in replacements.items():
-            text = text.replace(char, replacement)
-        
-        return text
-    
+
+        return _escape_html(text)
+
     @staticmethod
     def format_tweet_text(text: str, bold: bool = True) -> str:
         """Format tweet text for Telegram"""
         if not text:
             return ""
-        
-        # Escape HTML first
-        formatted_text = TextFormatter.escape_html(text)
-        
-        # Apply bold formatting if requested
-        if bold:
-            formatted_text = f"<b>{formatted_text}</b>"
-        
-        return formatted_text
+
+        return _format_tweet_text(text, bold)
     
+    @staticmethod
+    def format_tweet_texts(texts, bold: bool = True) -> list:
+        """Format a batch of tweet texts for Telegram in one pass"""
+        escaped = [_escape_html(text) if text else "" for text in texts]
+        if bold:
+            return [f"<b>{text}</b>" if text else "" for text in escaped]
+        return escaped
+
     @staticmethod
     def truncate_text(text: str, max_length: int = 1000) -> str:
         """Truncate text if it's too long"""
-        if len(text) <= max_length:
-            return text
-        
-        return text[:max_length-3] + "..."
+        return text if len(text) <= max_length else f"{text[:max_length - 3]}{_ELLIPSIS}"
+
+    @staticmethod
+    def make_truncator(max_length: int = 1000):
+        """Build a truncator with the cutoff precomputed for a fixed max_length"""
+        cutoff = max_length - 3
+
+        def truncate(text: str) -> str:
+            return text if len(text) <= max_length else f"{text[:cutoff]}{_ELLIPSIS}"
+
+        return truncate
 
 class HealthChecker:
     """Simple health checking utility"""
-    
+
+    __slots__ = ('last_successful_check', 'consecutive_failures',
+                 'max_consecutive_failures', '_cache', '_cache_ts',
+                 '_dirty', '_lock')
+
+    _CACHE_TTL = 1.0  # seconds a cached status stays fresh
+
     def __init__(self):
         self.last_successful_check = None
         self.consecutive_failures = 0
         self.max_consecutive_failures = 5
-    
+        self._cache = None
+        self._cache_ts = 0.0
+        # Set whenever the counters change; lets get_status reuse the
+        # cached dict in steady state without comparing fields
+        self._dirty = True
+        # Guards counter updates and status reads, which may come from
+        # executor threads as well as the event loop
+        self._lock = threading.Lock()
+
     def record_success(self):
         """Record a successful operation"""
-        import time
-        self.last_successful_check = time.time()
-        self.consecutive_failures = 0
-    
+        with self._lock:
+            self.last_successful_check = _now()
+            self.consecutive_failures = 0
+            self._dirty = True
+
     def record_failure(self):
         """Record a failed operation"""
-        self.consecutive_failures += 1
-    
+        with self._lock:
+            self.consecutive_failures += 1
+            self._dirty = True
+
     def is_healthy(self) -> bool:
         """Check if the system is considered healthy"""
         return self.consecutive_failures < self.max_consecutive_failures
-    
+
     def get_status(self) -> Dict[str, Any]:
-        """Get current health status"""
-        import time
-        current_time = time.time()
-        
-        return {
-            "healthy": self.is_healthy(),
-            "consecutive_failures": self.consecutive_failures,
-            "last_successful_check": self.last_successful_check,
-            "time_since_last_success": (
-                current_time - self.last_successful_check 
-                if self.last_successful_check else None
-            )
-        }
+        """Get current health status (cached for up to a second)"""
+        with self._lock:
+            current_time = _now()
+
+            if (not self._dirty
+                    and self._cache is not None
+                    and current_time - self._cache_ts < self._CACHE_TTL):
+                return self._cache
+
+            status = {
+                "healthy": self.is_healthy(),
+                "consecutive_failures": self.consecutive_failures,
+                "last_successful_check": self.last_successful_check,
+                "time_since_last_success": (
+                    current_time - self.last_successful_check
+                    if self.last_successful_check else None
+                )
+            }
+            self._cache = status
+            self._cache_ts = current_time
+            self._dirty = False
+            return status